@@ -4,17 +4,45 @@ AWS objects that have been configured by the MetGenC user, stage metadata files
 and post CNM messages to their destinations.
 """
 
+import threading
+
 import boto3
 
 KINESIS_PARTITION_KEY = "metgenc-duck"
 
+_thread_local = threading.local()
+
+
+def _session():
+    """
+    Returns a boto3 Session for the current thread. Clients are created from
+    a per-thread Session since creating them from boto3's shared default
+    Session is not thread-safe.
+    """
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = boto3.session.Session()
+    return _thread_local.session
+
+
+def _client(service_name):
+    """
+    Returns a boto3 client for the named service. Each thread creates its
+    client once and reuses it, along with its connection pool, for later
+    calls.
+    """
+    if not hasattr(_thread_local, "clients"):
+        _thread_local.clients = {}
+    if service_name not in _thread_local.clients:
+        _thread_local.clients[service_name] = _session().client(service_name)
+    return _thread_local.clients[service_name]
+
 
 def kinesis_stream_exists(stream_name):
     """
     Predicate which determines if a Kinesis stream with the given name exists
     in the configured AWS environment.
     """
-    client = boto3.client("kinesis")
+    client = _client("kinesis")
     try:
         client.describe_stream_summary(StreamName=stream_name)
         return True
@@ -26,7 +54,7 @@ def post_to_kinesis(stream_name, cnm_message):
     """
     Posts a message to a Kinesis stream.
     """
-    client = boto3.client("kinesis")
+    client = _client("kinesis")
     result = client.put_record(
         StreamName=stream_name, Data=cnm_message, PartitionKey=KINESIS_PARTITION_KEY
     )
@@ -39,7 +67,7 @@ def staging_bucket_exists(bucket_name):
     Predicate which determines if an s3 bucket with the given name exists
     in the configured AWS environment.
     """
-    client = boto3.client("s3")
+    client = _client("s3")
     try:
         client.head_bucket(Bucket=bucket_name)
         return True
@@ -51,7 +79,7 @@ def stage_file(s3_bucket_name, object_name, *, data=None, file=None):
     """
     Stages data into an s3 bucket at a given path.
     """
-    client = boto3.client("s3")
+    client = _client("s3")
     if not object_name:
         raise Exception("Missing object name for s3 target")
 
@@ -215,6 +215,13 @@ def validate(configuration):
             lambda name: aws.staging_bucket_exists(name),
             "The staging bucket does not exist.",
         ],
+        [
+            "checksum_type",
+            lambda checksum_type: checksum_type in constants.CHECKSUM_ALGORITHMS,
+            "The checksum_type must be one of "
+            + ", ".join(constants.CHECKSUM_ALGORITHMS)
+            + ".",
+        ],
         [
             "number",
             lambda number: 0 < number,
@@ -12,6 +12,19 @@ DEFAULT_CHECKSUM_TYPE = "SHA256"
 DEFAULT_NUMBER = 1000000
 DEFAULT_DRY_RUN = False
 
+# CNM checksum types and the hashlib algorithm that computes each one
+CHECKSUM_ALGORITHMS = {
+    "SHA512": "sha512",
+    "SHA256": "sha256",
+    "SHA1": "sha1",
+    "md5": "md5",
+}
+
+# Number of granules processed at once. Each worker hashes whole files and
+# each S3 upload starts its own boto3 transfer threads, while netCDF reads
+# are serialized, so a small pool keeps threads and connections bounded.
+GRANULE_WORKERS = 4
+
 # Logging
 ROOT_LOGGER = "metgenc"
 
@@ -31,8 +44,6 @@ SETTINGS_SECTION_NAME = "Settings"
 DEFAULT_SPATIAL_AXIS_SIZE = 6
 
 # Templates
-CNM_BODY_TEMPLATE = ("nsidc.metgen.templates", "cnm_body_template.json")
-CNM_FILES_TEMPLATE = ("nsidc.metgen.templates", "cnm_files_template.json")
 UMMG_BODY_TEMPLATE = ("nsidc.metgen.templates", "ummg_body_template.json")
 UMMG_TEMPORAL_SINGLE_TEMPLATE = (
     "nsidc.metgen.templates",
@@ -7,6 +7,7 @@ metadata and posting the notification message.
 import configparser
 import dataclasses
 import datetime as dt
+import functools
 import hashlib
 import importlib.resources
 import json
@@ -14,15 +15,14 @@ import logging
 import os.path
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from string import Template
 from typing import Callable
 
 import jsonschema
-from funcy import all, filter, partial, rcompose, take
-from pyfiglet import Figlet
+from funcy import all, partial, rcompose, take
 from returns.maybe import Maybe
-from rich.prompt import Confirm, Prompt
 
 from nsidc.metgen import aws, config, constants, netcdf_reader
 
@@ -53,10 +53,14 @@ def init_logging(configuration: config.Config):
     logger.addHandler(logfile_handler)
 
 
+@functools.cache
 def banner():
     """
     Displays the name of this utility using incredible ASCII-art.
     """
+    # Only needed for the banner, so it isn't imported with the module.
+    from pyfiglet import Figlet
+
     f = Figlet(font="slant")
     return f.renderText("metgenc")
 
@@ -67,6 +71,10 @@ def init_config(configuration_file):
     Prompts the user for configuration values and then creates a valid
     configuration file.
     """
+    # Only needed for the interactive prompts, so it isn't imported with the
+    # module.
+    from rich.prompt import Confirm, Prompt
+
     print(
         """This utility will create a granule metadata configuration file by prompting
         you for values for each of the configuration parameters."""
@@ -170,7 +178,11 @@ def init_config(configuration_file):
     cfg_parser.set(
         constants.SETTINGS_SECTION_NAME,
         "checksum_type",
-        Prompt.ask("Checksum type", default=constants.DEFAULT_CHECKSUM_TYPE),
+        Prompt.ask(
+            "Checksum type",
+            choices=list(constants.CHECKSUM_ALGORITHMS),
+            default=constants.DEFAULT_CHECKSUM_TYPE,
+        ),
     )
 
     print()
@@ -197,13 +209,16 @@ def prepare_output_dirs(configuration):
 
 
 def scrub_json_files(path):
-    print(f"Removing existing files in {path}")
-    for file_path in path.glob("*.json"):
-        try:
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-        except Exception as e:
-            print("Failed to delete %s: %s" % (file_path, e))
+    logger = logging.getLogger(constants.ROOT_LOGGER)
+    logger.info(f"Removing existing files in {path}")
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                os.unlink(entry.path)
+            except OSError as e:
+                logger.warning(f"Failed to delete {entry.path}: {e}")
 
 
 # -------------------------------------------------------------------
@@ -211,7 +226,7 @@ def scrub_json_files(path):
 # -------------------------------------------------------------------
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class Collection:
     """Collection info required to ingest a granule"""
 
@@ -219,7 +234,7 @@ class Collection:
     version: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Granule:
     """Granule to ingest"""
 
@@ -232,7 +247,7 @@ class Granule:
     cnm_message: Maybe[str] = Maybe.empty
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Action:
     """An audit of a single action performed on a Granule"""
 
@@ -243,7 +258,7 @@ class Action:
     endDatetime: Maybe[dt.datetime] = Maybe.empty
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Ledger:
     """An audit of the Actions performed on a Granule"""
 
@@ -282,21 +297,31 @@ def process(configuration: config.Config) -> None:
     recorded_operations = [partial(recorder, fn) for fn in configured_operations]
 
     # The complete pipeline of actions initializes a Ledger, performs all the
-    # operations, finalizes a Ledger, and logs the details of the Ledger.
-    pipeline = rcompose(start_ledger, *recorded_operations, end_ledger, log_ledger)
+    # operations, and finalizes a Ledger.
+    pipeline = rcompose(start_ledger, *recorded_operations, end_ledger)
 
     # Find all of the input granule files, limit the size of the list based
     # on the configuration, and execute the pipeline on each of the granules.
-    candidate_granules = [
-        Granule(p.name, data_filenames=[str(p)])
-        for p in Path(configuration.data_dir).glob("*.nc")
-    ]
-    granules = take(configuration.number, candidate_granules)
-    results = [pipeline(g) for g in granules]
+    # Granules are independent and their operations are dominated by file and
+    # network I/O, so they are processed concurrently; the Ledgers are logged
+    # in the order the granules were found.
+    granules = take(configuration.number, find_granules(configuration.data_dir))
+    with ThreadPoolExecutor(max_workers=constants.GRANULE_WORKERS) as executor:
+        results = [log_ledger(ledger) for ledger in executor.map(pipeline, granules)]
 
     summarize_results(results)
 
 
+def find_granules(data_dir):
+    """
+    Yield a Granule for each netCDF file in the data directory.
+    """
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".nc") and entry.is_file():
+                yield Granule(entry.name, data_filenames=[entry.path])
+
+
 # -------------------------------------------------------------------
 
 
@@ -369,14 +394,22 @@ def granule_collection(configuration: config.Config, granule: Granule) -> Granul
     """
     Find the Granule's Collection and add it to the Granule.
     """
-    # TODO: When we start querying CMR, refactor the pipeline to retrieve
-    # collection information from CMR once, then associate it with each
-    # granule.
     return dataclasses.replace(
-        granule, collection=Collection(configuration.auth_id, configuration.version)
+        granule, collection=collection(configuration.auth_id, configuration.version)
     )
 
 
+@functools.cache
+def collection(auth_id: str, version: int) -> Collection:
+    """
+    Return the Collection for the given auth_id and version. The result is
+    cached so that all granules in a run share one Collection.
+    """
+    # TODO: Retrieve the collection information from CMR. The cache ensures
+    # that happens once per collection rather than once per granule.
+    return Collection(auth_id, version)
+
+
 def prepare_granule(configuration: config.Config, granule: Granule) -> Granule:
     """
     Prepare the Granule for creating metadata and submitting it.
@@ -434,12 +467,16 @@ def create_ummg(configuration: config.Config, granule: Granule) -> Granule:
 
     # Populate the body template
     body = ummg_body_template().safe_substitute(
-        dataclasses.asdict(granule) | dataclasses.asdict(granule.collection) | summary
+        {
+            "producer_granule_id": granule.producer_granule_id,
+            "auth_id": granule.collection.auth_id,
+            "version": granule.collection.version,
+        }
+        | summary
     )
 
     # Save it all in a file.
-    with open(ummg_file_path, "tw") as f:
-        print(body, file=f)
+    write_file(ummg_file_path, body)
 
     return dataclasses.replace(granule, ummg_filename=ummg_file_path)
 
@@ -448,10 +485,10 @@ def stage_files(configuration: config.Config, granule: Granule) -> Granule:
     """
     Stage a set of files for the Granule in S3.
     """
+    prefix = s3_object_prefix(granule)
     stuff = granule.data_filenames + [granule.ummg_filename]
     for fn in stuff:
-        filename = os.path.basename(fn)
-        bucket_path = s3_object_path(granule, filename)
+        bucket_path = prefix + os.path.basename(fn)
         with open(fn, "rb") as f:
             aws.stage_file(configuration.staging_bucket_name, bucket_path, file=f)
 
@@ -462,37 +499,35 @@ def create_cnm(configuration: config.Config, granule: Granule) -> Granule:
     """
     Create a CNM submission message for the Granule.
     """
-    files_template = cnms_files_template()
-    body_template = cnms_body_template()
-    populated_file_templates = []
-
     granule_files = {
         "data": granule.data_filenames,
         "metadata": [granule.ummg_filename],
     }
-    for type, files in granule_files.items():
-        for file in files:
-            populated_file_templates.append(
-                json.loads(
-                    files_template.safe_substitute(
-                        cnms_file_json_parts(
-                            configuration.staging_bucket_name, granule, file, type
-                        )
-                    )
+    cnm_message = {
+        "version": constants.CNM_JSON_SCHEMA_VERSION,
+        "submissionTime": granule.submission_time,
+        "identifier": granule.uuid,
+        "collection": granule.collection.auth_id,
+        "provider": configuration.provider,
+        "product": {
+            "name": granule.producer_granule_id,
+            "dataVersion": str(granule.collection.version),
+            "files": [
+                cnms_file_json_parts(
+                    configuration.staging_bucket_name,
+                    configuration.checksum_type,
+                    granule,
+                    file,
+                    type,
                 )
-            )
+                for type, files in granule_files.items()
+                for file in files
+            ],
+        },
+    }
 
     return dataclasses.replace(
-        granule,
-        cnm_message=body_template.safe_substitute(
-            dataclasses.asdict(granule)
-            | dataclasses.asdict(granule.collection)
-            | dataclasses.asdict(configuration)
-            | {
-                "file_content": json.dumps(populated_file_templates),
-                "cnm_schema_version": constants.CNM_JSON_SCHEMA_VERSION,
-            }
-        ),
+        granule, cnm_message=json.dumps(cnm_message, separators=(",", ":"))
     )
 
 
@@ -504,8 +539,7 @@ def write_cnm(configuration: config.Config, granule: Granule) -> Granule:
         cnm_file = configuration.cnm_path().joinpath(
             granule.producer_granule_id + ".cnm.json"
         )
-        with open(cnm_file, "tw") as f:
-            print(granule.cnm_message, file=f)
+        write_file(cnm_file, granule.cnm_message)
     return granule
 
 
@@ -547,11 +581,13 @@ def summarize_results(ledgers: list[Ledger]) -> None:
     """
     Log a summary of the operations performed on all Granules.
     """
-    successful_count = len(list(filter(lambda r: r.successful, ledgers)))
-    failed_count = len(list(filter(lambda r: not r.successful, ledgers)))
+    successful_count = sum(1 for ledger in ledgers if ledger.successful)
+    failed_count = len(ledgers) - successful_count
     if len(ledgers) > 0:
-        start = ledgers[0].startDatetime
-        end = ledgers[-1].endDatetime
+        # Granules are processed concurrently, so the first and last Ledgers
+        # don't necessarily hold the earliest start and latest end.
+        start = min(ledger.startDatetime for ledger in ledgers)
+        end = max(ledger.endDatetime for ledger in ledgers)
     else:
         start = dt.datetime.now()
         end = dt.datetime.now()
@@ -571,16 +607,43 @@ def summarize_results(ledgers: list[Ledger]) -> None:
 # -------------------------------------------------------------------
 
 
-def cnms_file_json_parts(staging_bucket_name, granule, file, file_type):
-    file_mapping = dict()
+def cnms_file_json_parts(staging_bucket_name, checksum_type, granule, file, file_type):
     file_name = os.path.basename(file)
-    file_mapping["file_size"] = os.path.getsize(file)
-    file_mapping["file_type"] = file_type
-    file_mapping["checksum"] = checksum(file)
-    file_mapping["file_name"] = file_name
-    file_mapping["staging_uri"] = s3_url(staging_bucket_name, granule, file_name)
+    file_size, file_checksum = size_and_checksum(file, checksum_type)
 
-    return file_mapping
+    return {
+        "name": file_name,
+        "type": file_type,
+        "uri": s3_url(staging_bucket_name, granule, file_name),
+        "checksumType": checksum_type,
+        "checksum": file_checksum,
+        "size": file_size,
+    }
+
+
+def write_file(path, content):
+    """
+    Write the content, followed by a newline, to the file at path using a
+    single unbuffered file descriptor. The content goes to a temporary file
+    in the same directory which then atomically replaces path, so a reader
+    never sees a partially written file.
+    """
+    data = memoryview((content + "\n").encode("utf-8"))
+    # A random name can't collide with another writer or with a temporary
+    # file left behind by an interrupted run.
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    # Like open(), create the file with 0o666 and let the umask decide.
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
 
 
 def s3_url(staging_bucket_name, granule, filename):
@@ -595,14 +658,16 @@ def s3_object_path(granule, filename):
     """
     Returns the full s3 object path for the granule
     """
-    prefix = Template("external/${auth_id}/${version}/${uuid}/").safe_substitute(
-        {
-            "auth_id": granule.collection.auth_id,
-            "version": granule.collection.version,
-            "uuid": granule.uuid,
-        }
-    )
-    return prefix + filename
+    return s3_object_prefix(granule) + filename
+
+
+def s3_object_prefix(granule):
+    """
+    Returns the s3 object path prefix shared by all of the granule's files
+    """
+    auth_id = granule.collection.auth_id
+    version = granule.collection.version
+    return f"external/{auth_id}/{version}/{granule.uuid}/"
 
 
 # size is a sum of all associated data file sizes.
@@ -618,17 +683,21 @@ def metadata_summary(details):
     }
 
 
-def checksum(file):
-    BUF_SIZE = 65536
-    sha256 = hashlib.sha256()
+def size_and_checksum(file, checksum_type=constants.DEFAULT_CHECKSUM_TYPE):
+    """
+    Returns the size and checksum of a file, both taken from a single open
+    file descriptor. The checksum is computed with the algorithm named by
+    the CNM checksum type.
+    """
+    algorithm = constants.CHECKSUM_ALGORITHMS[checksum_type]
+    # The checksum is an integrity check, not a security control. Saying so
+    # lets algorithms a FIPS policy disallows, such as md5, still be used.
     with open(file, "rb") as f:
-        while True:
-            data = f.read(BUF_SIZE)
-            if not data:
-                break
-            sha256.update(data)
-
-    return sha256.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        digest = hashlib.file_digest(
+            f, lambda: hashlib.new(algorithm, usedforsecurity=False)
+        )
+    return size, digest.hexdigest()
 
 
 # TODO: Use the GranuleSpatialRepresentation value in the collection metadata
@@ -667,14 +736,6 @@ def ummg_spatial_gpolygon_template():
     return initialize_template(constants.UMMG_SPATIAL_GPOLYGON_TEMPLATE)
 
 
-def cnms_body_template():
-    return initialize_template(constants.CNM_BODY_TEMPLATE)
-
-
-def cnms_files_template():
-    return initialize_template(constants.CNM_FILES_TEMPLATE)
-
-
 def _open_text(anchor, name):
     for t in importlib.resources.files(anchor).iterdir():
         if t.name == name:
@@ -682,6 +743,7 @@ def _open_text(anchor, name):
     return None
 
 
+@functools.cache
 def initialize_template(resource_location):
     return Template(_open_text(*resource_location))
 
@@ -697,15 +759,30 @@ def validate(configuration, content_type):
     logger.info("")
     logger.info(f"Validating files in {output_file_path}...")
 
-    schema = json.load(_open_text(*schema_resource_location))
+    validator = schema_validator(schema_resource_location)
     # loop through all files and validate each one
-    for json_file in output_file_path.glob("*.json"):
-        apply_schema(schema, json_file, dummy_json)
+    for json_file in json_files(output_file_path):
+        apply_schema(validator, json_file, dummy_json)
 
     logger.info("Validations complete.")
     return True
 
 
+def json_files(path):
+    """
+    Yield the path of each JSON file in the given directory. A missing
+    directory has no JSON files.
+    """
+    try:
+        entries = os.scandir(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.path
+
+
 def file_type_path(configuration, content_type):
     """
     Return directory containing JSON files to be validated.
@@ -737,15 +814,31 @@ def schema_file_path(content_type):
             return "", {}
 
 
-def apply_schema(schema, json_file, dummy_json):
+@functools.cache
+def schema_validator(schema_resource_location):
+    """
+    Return a validator for the JSON schema at the given resource location.
+    The schema is read and checked once, then reused for every file.
+    """
+    schema = json.loads(_open_text(*schema_resource_location))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def apply_schema(validator, json_file, dummy_json):
     """
-    Apply JSON schema to generated JSON content.
+    Apply JSON schema validator to generated JSON content.
     """
     logger = logging.getLogger(constants.ROOT_LOGGER)
     with open(json_file) as jf:
         json_content = json.load(jf)
+        # Fill in only the parts that are missing rather than building a
+        # merged copy of the whole document.
+        for key, value in dummy_json.items():
+            json_content.setdefault(key, value)
         try:
-            jsonschema.validate(instance=json_content | dummy_json, schema=schema)
+            validator.validate(json_content)
             logger.info(f"No validation errors: {json_file}")
         except jsonschema.exceptions.ValidationError as err:
             logger.error(
@@ -5,6 +5,7 @@ from source science data files.
 
 import json
 import os.path
+import threading
 from datetime import timezone
 
 import xarray as xr
@@ -13,6 +14,10 @@ from pyproj import CRS, Transformer
 
 from nsidc.metgen import constants
 
+# The netCDF-C and HDF5 libraries are not thread-safe, so files read while
+# granules are processed concurrently are opened and read one at a time.
+_netcdf_lock = threading.Lock()
+
 
 def extract_metadata(netcdf_path):
     """
@@ -21,14 +26,13 @@ def extract_metadata(netcdf_path):
     """
 
     # TODO: handle errors if any needed attributes don't exist.
-    netcdf = xr.open_dataset(netcdf_path, decode_coords="all")
-
-    return {
-        "size_in_bytes": os.path.getsize(netcdf_path),
-        "production_date_time": ensure_iso(netcdf.attrs["date_modified"]),
-        "temporal": time_range(netcdf),
-        "geometry": {"points": json.dumps(spatial_values(netcdf))},
-    }
+    with _netcdf_lock, xr.open_dataset(netcdf_path, decode_coords="all") as netcdf:
+        return {
+            "size_in_bytes": os.path.getsize(netcdf_path),
+            "production_date_time": ensure_iso(netcdf.attrs["date_modified"]),
+            "temporal": time_range(netcdf),
+            "geometry": {"points": json.dumps(spatial_values(netcdf))},
+        }
 
 
 def time_range(netcdf):
@@ -1,5 +1,6 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import TemporaryFile
 
 import boto3
@@ -186,3 +187,18 @@ def test_staging_bucket_exists_for_valid_name(s3_bucket):
 def test_staging_bucket_exists_for_invalid_name(s3_bucket):
     bucket_name = "xyzzy"
     assert not aws.staging_bucket_exists(bucket_name)
+
+
+def test_session_is_reused_within_a_thread():
+    assert aws._session() is aws._session()
+
+
+def test_session_is_not_shared_between_threads():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_session = executor.submit(aws._session).result()
+    assert other_session is not aws._session()
+
+
+def test_client_is_reused_within_a_thread(aws_credentials):
+    assert aws._client("s3") is aws._client("s3")
+    assert aws._client("s3") is not aws._client("kinesis")
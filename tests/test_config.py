@@ -186,3 +186,16 @@ def test_validate_with_invalid_checks(m1, m2, m3, cfg_parser):
     with pytest.raises(config.ValidationError) as exc_info:
         config.validate(cfg)
     assert len(exc_info.value.errors) == 4
+
+
+@patch("nsidc.metgen.metgen.os.path.exists", return_value=True)
+@patch("nsidc.metgen.metgen.aws.kinesis_stream_exists", return_value=True)
+@patch("nsidc.metgen.metgen.aws.staging_bucket_exists", return_value=True)
+def test_validate_with_unknown_checksum_type(m1, m2, m3, cfg_parser):
+    cfg_parser.set("Settings", "checksum_type", "CRC32C")
+    cfg = config.configuration(cfg_parser, {})
+    with pytest.raises(config.ValidationError) as exc_info:
+        config.validate(cfg)
+    assert exc_info.value.errors == [
+        "The checksum_type must be one of SHA512, SHA256, SHA1, md5."
+    ]
@@ -1,9 +1,13 @@
+import dataclasses
 import datetime as dt
-from unittest.mock import patch
+import hashlib
+import os
+import stat
+from unittest.mock import Mock, patch
 
 import pytest
 from funcy import identity, partial
-from nsidc.metgen import config, metgen
+from nsidc.metgen import config, constants, metgen
 
 # Unit tests for the 'metgen' module functions.
 #
@@ -67,6 +71,21 @@ def test_banner():
     assert len(metgen.banner()) > 0
 
 
+def test_banner_is_rendered_once():
+    assert metgen.banner() is metgen.banner()
+
+
+def test_find_granules_yields_only_netcdf_files(tmp_path):
+    (tmp_path / "first.nc").touch()
+    (tmp_path / "second.nc.json").touch()
+    (tmp_path / "third.nc").mkdir()
+
+    granules = list(metgen.find_granules(tmp_path))
+
+    assert [g.producer_granule_id for g in granules] == ["first.nc"]
+    assert granules[0].data_filenames == [str(tmp_path / "first.nc")]
+
+
 def test_gets_single_file_size(one_granule_metadata):
     summary = metgen.metadata_summary(one_granule_metadata)
     assert summary["size_in_bytes"] == 150
@@ -84,6 +103,56 @@ def test_uses_first_file_as_default(granule_metadata_list):
     assert summary["geometry"] == "big"
 
 
+def test_granules_share_a_collection():
+    configuration = Mock(auth_id="ABCD", version=2)
+    first = metgen.granule_collection(configuration, metgen.Granule("foo"))
+    second = metgen.granule_collection(configuration, metgen.Granule("bar"))
+
+    assert first.collection == metgen.Collection("ABCD", 2)
+    assert first.collection is second.collection
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.collection.version = 3
+
+
+def test_size_and_checksum(tmp_path):
+    data_file = tmp_path / "data.bin"
+    data_file.write_bytes(b"xyzzy" * 100000)
+
+    expected = (500000, hashlib.sha256(b"xyzzy" * 100000).hexdigest())
+    assert metgen.size_and_checksum(data_file) == expected
+
+
+def test_size_and_checksum_uses_checksum_type(tmp_path):
+    data_file = tmp_path / "data.bin"
+    data_file.write_bytes(b"xyzzy")
+
+    expected = (5, hashlib.md5(b"xyzzy").hexdigest())
+    assert metgen.size_and_checksum(data_file, "md5") == expected
+
+
+def test_templates_are_read_once():
+    assert metgen.ummg_body_template() is metgen.ummg_body_template()
+
+
+def test_cnms_file_json_parts(tmp_path):
+    data_file = tmp_path / "xyzzy.nc"
+    data_file.write_bytes(b"xyzzy")
+    granule = metgen.Granule("foo", metgen.Collection("ABCD", 2), uuid="abcd-1234")
+
+    actual = metgen.cnms_file_json_parts(
+        "bucket", "SHA256", granule, str(data_file), "data"
+    )
+
+    assert actual == {
+        "name": "xyzzy.nc",
+        "type": "data",
+        "uri": "s3://bucket/external/ABCD/2/abcd-1234/xyzzy.nc",
+        "checksumType": "SHA256",
+        "checksum": hashlib.sha256(b"xyzzy").hexdigest(),
+        "size": 5,
+    }
+
+
 def test_returns_only_gpolygon():
     result = metgen.populate_spatial({"points": "some list of points"})
     assert "GPolygons" in result
@@ -107,6 +176,13 @@ def test_s3_object_path_has_no_leading_slash():
     assert metgen.s3_object_path(granule, "xyzzy.bin") == expected
 
 
+def test_s3_object_prefix_is_shared_by_object_paths():
+    granule = metgen.Granule("foo", metgen.Collection("ABCD", 2), uuid="abcd-1234")
+    prefix = metgen.s3_object_prefix(granule)
+    assert prefix == "external/ABCD/2/abcd-1234/"
+    assert metgen.s3_object_path(granule, "xyzzy.bin") == prefix + "xyzzy.bin"
+
+
 def test_s3_url_simple_case():
     staging_bucket_name = "xyzzy-bucket"
     granule = metgen.Granule("foo", metgen.Collection("ABCD", 2), uuid="abcd-1234")
@@ -114,6 +190,71 @@ def test_s3_url_simple_case():
     assert metgen.s3_url(staging_bucket_name, granule, "xyzzy.bin") == expected
 
 
+def test_write_file(tmp_path):
+    file_path = tmp_path / "message.json"
+    file_path.write_text("previous content that is longer than the new content")
+
+    metgen.write_file(file_path, '{"foo": "bär"}')
+
+    assert file_path.read_text(encoding="utf-8") == '{"foo": "bär"}\n'
+    assert list(tmp_path.iterdir()) == [file_path]
+
+
+def test_write_file_respects_umask(tmp_path):
+    file_path = tmp_path / "message.json"
+
+    old_umask = os.umask(0o002)
+    try:
+        metgen.write_file(file_path, "{}")
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o664
+
+
+def test_write_file_leaves_original_on_failure(tmp_path):
+    file_path = tmp_path / "message.json"
+    file_path.write_text("previous content")
+
+    with patch("nsidc.metgen.metgen.os.write", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            metgen.write_file(file_path, "new content")
+
+    assert file_path.read_text() == "previous content"
+    assert list(tmp_path.iterdir()) == [file_path]
+
+
+def test_summarize_results_counts_successes_and_failures(caplog):
+    now = dt.datetime(2099, 7, 4, 10, 11, 12)
+    ledgers = [
+        metgen.Ledger(metgen.Granule(name), [], successful, now, now)
+        for name, successful in [("a", True), ("b", False), ("c", True)]
+    ]
+
+    with caplog.at_level("INFO", logger="metgenc"):
+        metgen.summarize_results(ledgers)
+
+    assert "Successful: 2" in caplog.messages
+    assert "Failed    : 1" in caplog.messages
+
+
+def test_summarize_results_reports_earliest_start_and_latest_end(caplog):
+    early = dt.datetime(2099, 7, 4, 10, 0, 0)
+    middle = dt.datetime(2099, 7, 4, 10, 30, 0)
+    late = dt.datetime(2099, 7, 4, 11, 0, 0)
+    # Concurrent granules can finish in any order.
+    ledgers = [
+        metgen.Ledger(metgen.Granule("a"), [], True, middle, late),
+        metgen.Ledger(metgen.Granule("b"), [], True, early, middle),
+    ]
+
+    with caplog.at_level("INFO", logger="metgenc"):
+        metgen.summarize_results(ledgers)
+
+    assert f"Start     : {early}" in caplog.messages
+    assert f"End       : {late}" in caplog.messages
+
+
 @patch("nsidc.metgen.metgen.dt.datetime")
 def test_start_ledger(mock_datetime):
     now = dt.datetime(2099, 7, 4, 10, 11, 12)
@@ -184,6 +325,29 @@ def test_recorder_with_failing_operation():
     assert not new_ledger.actions[0].successful
 
 
+def test_json_files_yields_only_json_files(tmp_path):
+    (tmp_path / "first.json").touch()
+    (tmp_path / "second.json.bak").touch()
+    (tmp_path / "third.json").mkdir()
+
+    assert list(metgen.json_files(tmp_path)) == [str(tmp_path / "first.json")]
+
+
+def test_json_files_yields_nothing_for_missing_directory(tmp_path):
+    assert list(metgen.json_files(tmp_path / "missing")) == []
+
+
+def test_scrub_json_files_removes_only_json_files(tmp_path):
+    (tmp_path / "first.json").touch()
+    (tmp_path / "second.nc").touch()
+    (tmp_path / "third.json").mkdir()
+    (tmp_path / "fourth.json").symlink_to(tmp_path / "missing")
+
+    metgen.scrub_json_files(tmp_path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["second.nc", "third.json"]
+
+
 def test_no_dummy_json_for_cnm():
     schema_path, dummy_json = metgen.schema_file_path("cnm")
     assert schema_path
@@ -200,14 +364,30 @@ def test_dummy_json_for_ummg():
     assert dummy_json
 
 
+def test_schema_validator_is_reused():
+    validator = metgen.schema_validator(constants.CNM_JSON_SCHEMA)
+    assert metgen.schema_validator(constants.CNM_JSON_SCHEMA) is validator
+
+
 @patch("nsidc.metgen.metgen.open")
-@patch("nsidc.metgen.metgen.jsonschema.validate")
-def test_dummy_json_used(mock_validate, mock_open):
+def test_dummy_json_used(mock_open):
     fake_json = {"key": [{"foo": "bar"}]}
     fake_dummy_json = {"missing_key": "missing_foo"}
+    mock_validator = Mock()
 
     with patch("nsidc.metgen.metgen.json.load", return_value=fake_json):
-        metgen.apply_schema("schema file", "json_file", fake_dummy_json)
-        mock_validate.assert_called_once_with(
-            instance=fake_json | fake_dummy_json, schema="schema file"
+        metgen.apply_schema(mock_validator, "json_file", fake_dummy_json)
+        mock_validator.validate.assert_called_once_with(
+            {"key": [{"foo": "bar"}], "missing_key": "missing_foo"}
         )
+
+
+@patch("nsidc.metgen.metgen.open")
+def test_dummy_json_does_not_replace_existing_values(mock_open):
+    fake_json = {"GranuleUR": "RealUR"}
+    fake_dummy_json = {"GranuleUR": "FakeUR"}
+    mock_validator = Mock()
+
+    with patch("nsidc.metgen.metgen.json.load", return_value=fake_json):
+        metgen.apply_schema(mock_validator, "json_file", fake_dummy_json)
+        mock_validator.validate.assert_called_once_with({"GranuleUR": "RealUR"})